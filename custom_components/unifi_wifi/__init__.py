@@ -1,6 +1,6 @@
 """The Unifi Wifi integration."""
 
-import logging, asyncio
+import logging, asyncio, aiohttp
 import voluptuous as vol
 
 from homeassistant.const import (
@@ -16,6 +16,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import slugify
@@ -39,12 +40,15 @@ from .coordinator import UnifiWifiCoordinator
 _LOGGER = logging.getLogger(__name__)
 
 
+# Shared validators are built once and reused by the nested schemas below
+_QR_QUALITY_VALIDATOR = vol.In(['L','M','Q','H'])
+
 _PPSK_SCHEMA = vol.Schema({
     vol.Required(CONF_NAME): cv.string,
     vol.Optional(CONF_FILL_COLOR, default='#000000'): cv.color_hex,
     vol.Optional(CONF_BACK_COLOR, default='#ffffff'): cv.color_hex,
     vol.Optional(CONF_FILE_OUTPUT, default=True): cv.boolean,
-    vol.Optional(CONF_QR_QUALITY, default='M'): vol.In(['L','M','Q','H'])
+    vol.Optional(CONF_QR_QUALITY, default='M'): _QR_QUALITY_VALIDATOR
 })
 
 _AP_SCHEMA = vol.Schema({
@@ -60,7 +64,7 @@ _SSID_SCHEMA = vol.Schema({
     vol.Optional(CONF_FILL_COLOR, default='#000000'): cv.color_hex,
     vol.Optional(CONF_BACK_COLOR, default='#ffffff'): cv.color_hex,
     vol.Optional(CONF_FILE_OUTPUT, default=True): cv.boolean,
-    vol.Optional(CONF_QR_QUALITY, default='M'): vol.In(['L','M','Q','H'])
+    vol.Optional(CONF_QR_QUALITY, default='M'): _QR_QUALITY_VALIDATOR
 })
 
 _SITE_SCHEMA = vol.Schema({
@@ -85,14 +89,20 @@ _SITE_SCHEMA = vol.Schema({
 
 def _unique_names(obj: ConfigType):
     """Verify each host + site name is unique."""
-    names = [slugify(conf[CONF_NAME]) for conf in obj]
-    msg = f"Duplicate name values are not allowed: {names}"
-    vol.Unique(msg)(names)
+    # single pass: stop at the first duplicate instead of building a list for vol.Unique
+    names = set()
+    for conf in obj:
+        name = slugify(conf[CONF_NAME])
+        if name in names:
+            raise vol.Invalid(f"Duplicate name values are not allowed: {name}")
+        names.add(name)
     return obj
 
+_SITES_SCHEMA = vol.Schema([_SITE_SCHEMA])
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.All(
-        cv.ensure_list, [_SITE_SCHEMA], _unique_names,
+        cv.ensure_list, _SITES_SCHEMA, _unique_names,
     )},
     extra=vol.ALLOW_EXTRA,
 )
@@ -100,10 +110,25 @@ CONFIG_SCHEMA = vol.Schema({
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
-    coordinators = [UnifiWifiCoordinator(hass, conf) for conf in config[DOMAIN]]
+    # One session is shared by every coordinator so TCP/TLS connections are reused.
+    # Home Assistant closes it on shutdown (auto_cleanup).
+    # https://docs.aiohttp.org/en/stable/client_advanced.html#ssl-control-for-tcp-sockets
+    # The login cookie is explicitly passed in each request's headers, so no cookie jar is kept.
+    # https://docs.aiohttp.org/en/stable/client_advanced.html#cookie-safety
+    session = async_create_clientsession(
+        hass,
+        verify_ssl=False,
+        cookie_jar=aiohttp.DummyCookieJar()
+    )
+
+    coordinators = [UnifiWifiCoordinator(hass, conf, session) for conf in config[DOMAIN]]
     hass.data[DOMAIN] = config[DOMAIN]
 
-    hass.async_create_task(async_load_platform(hass, 'image', DOMAIN, coordinators, config))
+    # load the image platform without holding up the rest of startup
+    hass.async_create_background_task(
+        async_load_platform(hass, 'image', DOMAIN, coordinators, config),
+        name=f"{DOMAIN} load image platform"
+    )
 
     await register_services(hass, coordinators)
 
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import logging, aiohttp, asyncio
 
+from time import monotonic
+
 from homeassistant.const import (
     CONF_HOST,
     CONF_MAC,
@@ -50,7 +52,7 @@ class ApiError(IntegrationError):
 class UnifiWifiCoordinator(DataUpdateCoordinator):
     """Representation of a Unifi Wifi coordinator"""
 
-    def __init__(self, hass: HomeAssistant, config: ConfigType):
+    def __init__(self, hass: HomeAssistant, config: ConfigType, session: aiohttp.ClientSession):
         super().__init__(
             hass,
             _LOGGER,
@@ -61,6 +63,8 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
         self.networkconf = []
         self.sysinfo = []
         self.wlanconf = []
+        self.wlanconf_index = {} # SSID name -> position in wlanconf
+        self.last_update_time = 0.0 # monotonic time of the last successful update
         self.name = config[CONF_NAME]
         self.verify_ssl = config[CONF_VERIFY_SSL]
         self.site = config[CONF_SITE]
@@ -72,6 +76,8 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
         self._aps = config[CONF_MANAGED_APS]
         self._timeout = config[CONF_TIMEOUT]
         self._unifi_os = config[CONF_UNIFI_OS]
+        # shared across all coordinators so connections are pooled and kept alive between polls
+        self._session = session
         if self._unifi_os:
             self._login_prefix = '/api/auth'
             self._api_prefix = '/proxy/network'
@@ -83,7 +89,9 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
         """Fetch the latest data from a UniFi controller."""
         try:
             async with asyncio.timeout(self._timeout):
-                return await self._update_info()
+                data = await self._update_info()
+            self.last_update_time = monotonic()
+            return data
         # Note: asyncio.TimeoutError and aiohttp.ClientError are already
         # handled by the data update coordinator.
         except ApiAuthError as err:
@@ -200,6 +208,7 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
 
         conf = await response.json()
         self.wlanconf = conf['data']
+        self.wlanconf_index = {wlan[UNIFI_NAME]: i for i, wlan in enumerate(self.wlanconf)}
 
     async def _get_restsetting(self, session: aiohttp.ClientSession, headers: list[dict]) -> list[dict]:
         """Get rest setting info from a UniFi controller."""
@@ -218,79 +227,69 @@ class UnifiWifiCoordinator(DataUpdateCoordinator):
 
         It is called by the coordinator to keep itself and its entities updated.
         """
-        async with aiohttp.ClientSession(
-            # https://docs.aiohttp.org/en/stable/client_advanced.html#ssl-control-for-tcp-sockets
-            connector=aiohttp.TCPConnector(ssl=False),
-            # without unsafe=True the login response cookie must be explicitly passed in each request
-            # https://docs.aiohttp.org/en/stable/client_advanced.html#cookie-safety
-            #cookie_jar=aiohttp.CookieJar(unsafe=True)
-        ) as session:
-            _LOGGER.debug("_update_info Updating info for %s", self.name)
+        session = self._session
+        _LOGGER.debug("_update_info Updating info for %s", self.name)
 
-            headers = await self._login(session)
+        headers = await self._login(session)
 
-            await self._get_sysinfo(session, headers)
-            await self._get_networkconf(session, headers)
-            await self._get_wlanconf(session, headers)
-            await self._logout(session, headers)
+        await self._get_sysinfo(session, headers)
+        await self._get_networkconf(session, headers)
+        await self._get_wlanconf(session, headers)
+        await self._logout(session, headers)
 
-            del headers # not sure if this is necessary
-            return await session.close()
+        del headers # not sure if this is necessary
 
     async def set_wlanconf(self, ssid: str, payload: str, force: bool = False) -> bool:
         """Update a wireless network setting."""
-        async with aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(ssl=False)
-        ) as session:
-            _LOGGER.debug("set_wlanconf Setting new conf value for %s for %s", ssid, self.name)
+        session = self._session
+        _LOGGER.debug("set_wlanconf Setting new conf value for %s for %s", ssid, self.name)
 
-            headers = await self._login(session)
+        headers = await self._login(session)
 
-            # Find the unifi identification number for a specific SSID
-            await self._get_wlanconf(session, headers)
-            idssid = [wlan[UNIFI_NAME] for wlan in self.wlanconf].index(ssid)
-            idno = self.wlanconf[idssid][UNIFI_ID]
+        # Find the unifi identification number for a specific SSID
+        await self._get_wlanconf(session, headers)
+        try:
+            idssid = self.wlanconf_index[ssid]
+        except KeyError as err:
+            raise IntegrationError(f"SSID {ssid} does not exist on coordinator {self.name}") from err
+        idno = self.wlanconf[idssid][UNIFI_ID]
 
-            kwargs = {'headers': headers, 'json': payload}
-            path = f"{self._api_prefix}/api/s/{self.site}/rest/wlanconf/{idno}"
-            response = await self._request(session, 'put', path, **kwargs)
+        kwargs = {'headers': headers, 'json': payload}
+        path = f"{self._api_prefix}/api/s/{self.site}/rest/wlanconf/{idno}"
+        response = await self._request(session, 'put', path, **kwargs)
 
-            if self._force or force:
-                await self._force_provision(session, headers)
+        if self._force or force:
+            await self._force_provision(session, headers)
 
-            await self._logout(session, headers)
+        await self._logout(session, headers)
 
-            del headers
-            await session.close()
+        del headers
 
-            return await self.async_request_refresh()
+        return await self.async_request_refresh()
 
     async def set_restsetting(self, key: str, payload: str, force: bool = False) -> bool:
         """Update a site setting."""
         # BE CAREFUL! This function is currently intended only to update hotspot credentials.
         # However, it is able to change many site settings when provided an existing key/payload combination
-        async with aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(ssl=False)
-        ) as session:
-            _LOGGER.debug("set_restsetting Setting new key (%s) value for %s", key, self.name)
+        session = self._session
+        _LOGGER.debug("set_restsetting Setting new key (%s) value for %s", key, self.name)
 
-            headers = await self._login(session)
+        headers = await self._login(session)
 
-            # download current site settings and read the _id value of the intended key
-            data = await self._get_restsetting(session, headers)
-            idkey = [d['key'] for d in data].index(key)
-            idno = data[idkey][UNIFI_ID]
+        # download current site settings and read the _id value of the intended key
+        data = await self._get_restsetting(session, headers)
+        idkey = [d['key'] for d in data].index(key)
+        idno = data[idkey][UNIFI_ID]
 
-            kwargs = {'headers': headers, 'json': payload}
-            path = f"{self._api_prefix}/api/s/{self.site}/rest/setting/{key}/{idno}"
-            await self._request(session, 'put', path, **kwargs)
+        kwargs = {'headers': headers, 'json': payload}
+        path = f"{self._api_prefix}/api/s/{self.site}/rest/setting/{key}/{idno}"
+        await self._request(session, 'put', path, **kwargs)
 
-            if self._force or force:
-                await self._force_provision(session, headers)
+        if self._force or force:
+            await self._force_provision(session, headers)
 
-            await self._logout(session, headers)
+        await self._logout(session, headers)
 
-            del headers
-            await session.close()
+        del headers
 
-            return await self.async_request_refresh()
\ No newline at end of file
+        return await self.async_request_refresh()
\ No newline at end of file
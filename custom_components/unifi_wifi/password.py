@@ -1,11 +1,27 @@
 """Random password generation function."""
 
-import secrets, string
+import functools, secrets, string
 
 from xkcdpass import xkcd_password as xp
 
 WORD_FILE = '/config/custom_components/unifi_wifi/eff_large_wordlist.txt'
 
+# Methods that never touch the filesystem and are cheap enough to run in the event loop
+FAST_METHODS = frozenset(['char'])
+
+
+@functools.cache
+def _words() -> tuple[str, ...]:
+    """Read the word file once and keep it in memory."""
+    with open(WORD_FILE) as f:
+        return tuple(word.strip() for word in f)
+
+
+@functools.cache
+def _xkcd_words(_min_length: int, _max_length: int) -> list[str]:
+    """Build (once per length range) the xkcdpass word list."""
+    return xp.generate_wordlist(wordfile=WORD_FILE, min_length=_min_length, max_length=_max_length)
+
 
 def create(_method: str, _delimiter: str, _min_length: int, _max_length: int, _word_count: int, _char_count: int):
     # https://github.com/redacted/XKCD-password-generator#using-xkcdpass-as-an-imported-module
@@ -13,7 +29,7 @@ def create(_method: str, _delimiter: str, _min_length: int, _max_length: int, _w
         # xp.locate_wordfile() defaults to a looking for eff_long contained in xkcdpass python module
         # however this is not available to the function so we specify a local copy of eff_long
         # this file is located in the current working directory
-        mywords = xp.generate_wordlist(wordfile=WORD_FILE, min_length=_min_length, max_length=_max_length)
+        mywords = _xkcd_words(_min_length, _max_length)
         # x = xp.generate_xkcdpassword(mywords, numwords=_word_count, delimiter=' ')
         x = xp.generate_xkcdpassword(mywords, numwords=_word_count, delimiter=_delimiter)
 
@@ -24,10 +40,9 @@ def create(_method: str, _delimiter: str, _min_length: int, _max_length: int, _w
     # Other platforms may need to provide their own word-list.
     # https://www.eff.org/files/2016/07/18/eff_large_wordlist.txt
     elif _method == 'word':
-        with open(WORD_FILE) as f:
-            words = [word.strip() for word in f]
-            # x = ' '.join(secrets.choice(words) for i in range(_word_count))
-            x = _delimiter.join(secrets.choice(words) for i in range(_word_count))
+        words = _words()
+        # x = ' '.join(secrets.choice(words) for i in range(_word_count))
+        x = _delimiter.join(secrets.choice(words) for i in range(_word_count))
 
     # https://docs.python.org/3/library/secrets.html#recipes-and-best-practices
     # 'char' method
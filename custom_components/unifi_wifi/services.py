@@ -5,6 +5,8 @@ from __future__ import annotations
 import logging, asyncio, json
 import voluptuous as vol
 
+from time import monotonic
+
 from homeassistant.auth.permissions.const import POLICY_CONTROL
 from homeassistant.const import (
     CONF_ENABLED,
@@ -16,7 +18,7 @@ from homeassistant.const import (
     CONF_TARGET
 )
 from homeassistant.core import HomeAssistant, ServiceCall, Context
-from homeassistant.exceptions import InvalidEntityFormatError, ServiceValidationError, Unauthorized, IntegrationError
+from homeassistant.exceptions import InvalidEntityFormatError, ServiceValidationError, Unauthorized, UnknownUser, IntegrationError
 from homeassistant.helpers import config_validation as cv, entity_registry
 from homeassistant.helpers import service
 from homeassistant.helpers.service import async_register_admin_service
@@ -56,18 +58,23 @@ SERVICE_WLAN_PASSWORD = 'wlan_password'
 
 EXTRA_DEBUG = False
 
+# Minimum age (in seconds) of coordinator data before a service call requests a refresh
+MIN_REFRESH_INTERVAL = 30
+
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _is_ascii(value: Any) -> str:
-    """Verify a string is only ascii characters."""
-    # password is already validated as a string in SERVICE_*_PASSWORD_SCHEMA
-    # should it be further validated as ascii?
+def _ascii_password(value: Any) -> str:
+    """Verify a password is a string of 8 to 63 ascii characters."""
+    # string, length and ascii checks are done in a single validator
     #    https://stackoverflow.com/questions/196345/how-to-check-if-a-string-in-python-is-in-ascii
     #    https://docs.python.org/3/library/stdtypes.html#str.isascii
+    value = cv.string(value)
+    if not 8 <= len(value) <= 63:
+        raise vol.Invalid("Password must be between 8 and 63 characters long.")
     if not value.isascii():
-        raise ServiceValidationError("Password may only contain ASCII characters.")
+        raise vol.Invalid("Password may only contain ASCII characters.")
     return value
 
 def _check_custom_password(obj: ConfigType):
@@ -95,53 +102,47 @@ TARGET_SCHEMA = vol.Any(
     cv.entity_id
 )
 
-PASSWORD_SCHEMA = vol.Schema({
-    vol.Optional(CONF_PASSWORD): vol.All(
-        cv.string, vol.Length(min=8, max=63), _is_ascii
-    ),
-    vol.Optional(CONF_RANDOM, default=True): cv.boolean,
+# Shared validators are built once here and reused by every schema below
+# instead of constructing an identical validator chain per schema.
+_WORD_LENGTH_VALIDATOR = vol.All(
+    vol.Coerce(int), vol.Range(min=3, max=9)
+)
+_WORD_COUNT_VALIDATOR = vol.All(
+    vol.Coerce(int), vol.Range(min=3, max=6)
+)
+_CHAR_COUNT_VALIDATOR = vol.All(
+    vol.Coerce(int), vol.Range(min=8, max=63)
+)
+
+_RANDOM_PASSWORD_FIELDS = {
     vol.Optional(CONF_METHOD, default='word'): vol.In(CONF_METHOD_TYPES),
-    vol.Optional(CONF_DELIMITER, default='dash'): vol.In(CONF_DELIMITER_TYPES),
-    vol.Optional(CONF_MIN_LENGTH, default=5): vol.All(
-        vol.Coerce(int), vol.Range(min=3, max=9)
-    ),
-    vol.Optional(CONF_MAX_LENGTH, default=8): vol.All(
-        vol.Coerce(int), vol.Range(min=3, max=9)
+    # coerce the delimiter name into its character during validation
+    vol.Optional(CONF_DELIMITER, default='dash'): vol.All(
+        vol.In(CONF_DELIMITER_TYPES), CONF_DELIMITER_TYPES.get
     ),
-    vol.Optional(CONF_WORD_COUNT, default=4): vol.All(
-        vol.Coerce(int), vol.Range(min=3, max=6)
-    ),
-    vol.Optional(CONF_CHAR_COUNT, default=24): vol.All(
-        vol.Coerce(int), vol.Range(min=8, max=63)
-    )
+    vol.Optional(CONF_MIN_LENGTH, default=5): _WORD_LENGTH_VALIDATOR,
+    vol.Optional(CONF_MAX_LENGTH, default=8): _WORD_LENGTH_VALIDATOR,
+    vol.Optional(CONF_WORD_COUNT, default=4): _WORD_COUNT_VALIDATOR,
+    vol.Optional(CONF_CHAR_COUNT, default=24): _CHAR_COUNT_VALIDATOR
+}
+
+PASSWORD_SCHEMA = vol.Schema({
+    vol.Optional(CONF_PASSWORD): _ascii_password,
+    vol.Optional(CONF_RANDOM, default=True): cv.boolean,
+    **_RANDOM_PASSWORD_FIELDS
 })
 
 # DEPRECATED
 SERVICE_CUSTOM_PASSWORD_SCHEMA = vol.Schema({
     vol.Required(CONF_TARGET): TARGET_SCHEMA,
-    vol.Required(CONF_PASSWORD): vol.All(
-        cv.string, vol.Length(min=8, max=63), _is_ascii
-    ),
+    vol.Required(CONF_PASSWORD): _ascii_password,
 })
 
 # DEPRECATED
 SERVICE_RANDOM_PASSWORD_SCHEMA = vol.All(
     vol.Schema({
         vol.Required(CONF_TARGET): TARGET_SCHEMA,
-        vol.Optional(CONF_METHOD,default='word'): vol.In(CONF_METHOD_TYPES),
-        vol.Optional(CONF_DELIMITER, default='dash'): vol.In(CONF_DELIMITER_TYPES),
-        vol.Optional(CONF_MIN_LENGTH, default=5): vol.All(
-            vol.Coerce(int), vol.Range(min=3, max=9)
-        ),
-        vol.Optional(CONF_MAX_LENGTH, default=8): vol.All(
-            vol.Coerce(int), vol.Range(min=3, max=9)
-        ),
-        vol.Optional(CONF_WORD_COUNT, default=4): vol.All(
-            vol.Coerce(int), vol.Range(min=3, max=6)
-        ),
-        vol.Optional(CONF_CHAR_COUNT, default=24): vol.All(
-            vol.Coerce(int), vol.Range(min=8, max=63)
-        ),
+        **_RANDOM_PASSWORD_FIELDS
     }),
     _check_word_lengths
 )
@@ -175,45 +176,46 @@ SERVICE_WLAN_PASSWORD_SCHEMA = vol.All(
 
 async def register_services(hass: HomeAssistant, coordinators: List[UnifiWifiCoordinator]) -> bool:
 
-    def _coordinator_index(_coordinator: str):
-        """Find the index of a specific coordinator."""
+    # build the name lookup once instead of scanning the coordinators list on every call
+    coordinator_by_name = {x.name: x for x in coordinators}
+
+    def _get_coordinator(_coordinator: str) -> UnifiWifiCoordinator:
+        """Find a specific coordinator by name."""
         try:
-            #return [x[CONF_NAME] for x in coordinators].index(_coordinator)
-            return [x.name for x in coordinators].index(_coordinator)
-        except ValueError as err:
+            return coordinator_by_name[_coordinator]
+        except KeyError as err:
             raise ServiceValidationError(f"Coordinator {_coordinator} is not configured in YAML: {err}")
 
 
-    def _ssid_index(_index: int, _ssid: str):
+    def _ssid_index(_coordinator: UnifiWifiCoordinator, _ssid: str):
         """Find the index of an ssid on a specific coordinator."""
-        hass.add_job(coordinators[_index].async_request_refresh())
+        # only refresh stale data and do not track the refresh against startup
+        if monotonic() - _coordinator.last_update_time > MIN_REFRESH_INTERVAL:
+            hass.async_create_background_task(
+                _coordinator.async_request_refresh(),
+                name=f"{DOMAIN} {_coordinator.name} ssid refresh"
+            )
 
         try:
-            return [x[UNIFI_NAME] for x in coordinators[_index].wlanconf].index(_ssid)
-        except ValueError as err:
-            raise ServiceValidationError(f"SSID {_ssid} does not exist on coordinator {coordinators[_index].name}: {err}")
+            return _coordinator.wlanconf_index[_ssid]
+        except KeyError as err:
+            raise ServiceValidationError(f"SSID {_ssid} does not exist on coordinator {_coordinator.name}: {err}")
 
 
     async def _random_password(call: ServiceCall) -> str:
         """SOMETHING DESCRIPTIVE."""
         method = call.data.get(CONF_METHOD)
-        delimiter_raw = call.data.get(CONF_DELIMITER)
+        delimiter = call.data.get(CONF_DELIMITER)
         min_length = call.data.get(CONF_MIN_LENGTH)
         max_length = call.data.get(CONF_MAX_LENGTH)
         word_count = call.data.get(CONF_WORD_COUNT)
         char_count = call.data.get(CONF_CHAR_COUNT)
-        if delimiter_raw == 'dash':
-            delimiter = '-'
-        elif delimiter_raw == 'pipe':
-            delimiter = '|'
-        elif delimiter_raw == 'space':
-            delimiter = ' '
-        elif delimiter_raw == 'underscore':
-            delimiter = '_'
-        else:
-            delimiter = ''
 
-        password = await hass.async_add_executor_job(pw.create, method, delimiter, min_length, max_length, word_count, char_count)
+        # only hand off to the executor when the method may need to read the word file
+        if method in pw.FAST_METHODS:
+            password = pw.create(method, delimiter, min_length, max_length, word_count, char_count)
+        else:
+            password = await hass.async_add_executor_job(pw.create, method, delimiter, min_length, max_length, word_count, char_count)
 
         return password
 
@@ -241,15 +243,18 @@ async def register_services(hass: HomeAssistant, coordinators: List[UnifiWifiCoo
                 #_LOGGER.debug("Entity ID %s is not valid: %s", entity_id, err)
                 raise InvalidEntityFormatError(f"Entity ID {entity_id} is not valid: {err}")
 
+        # look up the current user once per call instead of once per entity
+        user = None
+        if _context.user_id:
+            user = await hass.auth.async_get_user(_context.user_id)
+            if user is None:
+                raise UnknownUser(context = _context, permission = POLICY_CONTROL)
+
         states = []
         for entity_id in valid_entities:
             # check entity permissions for the current user
-            if _context.user_id:
-                user = await hass.auth.async_get_user(_context.user_id)
-                if user is None:
-                    raise UnknownUser(context = _context, entity_id = entity_id, permission = POLICY_CONTROL)
-                if not user.permissions.check_entity(entity_id, POLICY_CONTROL):
-                    raise Unauthorized(context =_context, entity_id = entity_id, permission = POLICY_CONTROL)
+            if user is not None and not user.permissions.check_entity(entity_id, POLICY_CONTROL):
+                raise Unauthorized(context =_context, entity_id = entity_id, permission = POLICY_CONTROL)
 
             state = hass.states.get(entity_id)
             states.append(state)
@@ -257,7 +262,6 @@ async def register_services(hass: HomeAssistant, coordinators: List[UnifiWifiCoo
         if EXTRA_DEBUG: _LOGGER.debug("valid_states: %s", states)
         return states
 
-    # DEPRECATED
     async def _change_password(call: ServiceCall, _random: bool = False):
         """Send custom or randomly generated password to a coordinator."""
         states = await _valid_entity_states(call.data.get(CONF_TARGET), call.context)
@@ -268,8 +272,7 @@ async def register_services(hass: HomeAssistant, coordinators: List[UnifiWifiCoo
         # create list of wlan configurations to be sent to controllers
         requests = []
         for entity in states:
-            idcoord = _coordinator_index(entity.attributes.get(CONF_COORDINATOR))
-            coordinator = coordinators[idcoord]
+            coordinator = _get_coordinator(entity.attributes.get(CONF_COORDINATOR))
             ssid = entity.attributes.get(CONF_SSID)
 
             if _random:
@@ -277,7 +280,7 @@ async def register_services(hass: HomeAssistant, coordinators: List[UnifiWifiCoo
 
             ppsk = bool(entity.attributes.get(CONF_PPSK))
             if ppsk:
-                keys = coordinator.wlanconf[_ssid_index(idcoord, ssid)][UNIFI_PRESHARED_KEYS]
+                keys = coordinator.wlanconf[_ssid_index(coordinator, ssid)][UNIFI_PRESHARED_KEYS]
                 network_id = entity.attributes.get(UNIFI_NETWORKCONF_ID)
                 idkey = [x[UNIFI_NETWORKCONF_ID] for x in keys].index(network_id)
 
@@ -346,8 +349,7 @@ async def register_services(hass: HomeAssistant, coordinators: List[UnifiWifiCoo
         # send wlanconf change requests to controllers
         if EXTRA_DEBUG: _LOGGER.debug("requests: %s", requests)
         for request in requests:
-            idcoord = _coordinator_index(request[CONF_COORDINATOR])
-            coordinator = coordinators[idcoord]
+            coordinator = _get_coordinator(request[CONF_COORDINATOR])
             for r in request[CONF_DATA]:
                 try:
                     payload = {UNIFI_PRESHARED_KEYS: r[UNIFI_PRESHARED_KEYS]}
@@ -375,8 +377,7 @@ async def register_services(hass: HomeAssistant, coordinators: List[UnifiWifiCoo
 
         requests = []
         for entity in states:
-            idcoord = _coordinator_index(entity.attributes.get(CONF_COORDINATOR))
-            coordinator = coordinators[idcoord]
+            coordinator = _get_coordinator(entity.attributes.get(CONF_COORDINATOR))
             ssid = entity.attributes.get(CONF_SSID)
 
             try:
@@ -408,8 +409,7 @@ async def register_services(hass: HomeAssistant, coordinators: List[UnifiWifiCoo
         # send wlanconf change requests to controllers
         if EXTRA_DEBUG: _LOGGER.debug("requests: %s", requests)
         for request in requests:
-            idcoord = _coordinator_index(request[CONF_COORDINATOR])
-            coordinator = coordinators[idcoord]
+            coordinator = _get_coordinator(request[CONF_COORDINATOR])
             for r in request[CONF_DATA]:
                 # boolean python values (uppercase) need to be json serialized (lowercase)
                 # payload = json.dumps({key: y[key]})
@@ -440,8 +440,7 @@ async def register_services(hass: HomeAssistant, coordinators: List[UnifiWifiCoo
     async def hotspot_password_service(call: ServiceCall):
         """Set a new hotspot password."""
         target = call.data.get(CONF_COORDINATOR)
-        idcoord = _coordinator_index(target)
-        coordinator = coordinators[idcoord]
+        coordinator = _get_coordinator(target)
         
         random = call.data.get(CONF_RANDOM)
         if random:
@@ -455,152 +454,19 @@ async def register_services(hass: HomeAssistant, coordinators: List[UnifiWifiCoo
 
     async def wlan_password_service(call: ServiceCall):
         """Set a new wlan password."""
-        states = await _valid_entity_states(call.data.get(CONF_TARGET), call.context)
+        await _change_password(call, call.data.get(CONF_RANDOM))
 
-        random = call.data.get(CONF_RANDOM)
-        if not random:
-            password = call.data.get(CONF_PASSWORD)
-
-        # create list of wlan configurations to be sent to controllers
-        requests = []
-        for entity in states:
-            idcoord = _coordinator_index(entity.attributes.get(CONF_COORDINATOR))
-            coordinator = coordinators[idcoord]
-            ssid = entity.attributes.get(CONF_SSID)
-
-            if random:
-                password = await _random_password(call)
 
-            ppsk = bool(entity.attributes.get(CONF_PPSK))
-            if ppsk:
-                keys = coordinator.wlanconf[_ssid_index(idcoord, ssid)][UNIFI_PRESHARED_KEYS]
-                network_id = entity.attributes.get(UNIFI_NETWORKCONF_ID)
-                idkey = [x[UNIFI_NETWORKCONF_ID] for x in keys].index(network_id)
-
-            try:
-                idrequestcoord = [x[CONF_COORDINATOR] for x in requests].index(entity.attributes.get(CONF_COORDINATOR))
-                if EXTRA_DEBUG: _LOGGER.debug("found coordinator entry in requests list")
-                try:
-                    idrequestssid = [y[CONF_SSID] for y in requests[idrequestcoord][CONF_DATA]].index(entity.attributes.get(CONF_SSID))
-                    if EXTRA_DEBUG: _LOGGER.debug("found ssid entry in requests list")
-                    if ppsk:
-                        # check for unique ppsk passwords on a found ssid request
-                        if password in [x[CONF_PASSWORD] for x in requests[idrequestcoord][CONF_DATA][idrequestssid][UNIFI_PRESHARED_KEYS]]:
-                            raise IntegrationError("Networks on the same PPSK-enabled SSID cannot have the same password")
-
-                        requests[idrequestcoord][CONF_DATA][idrequestssid][UNIFI_PRESHARED_KEYS][idkey] = {
-                            CONF_PASSWORD: password,
-                            UNIFI_NETWORKCONF_ID: network_id
-                        }
-                        if EXTRA_DEBUG: _LOGGER.debug("ppsk entry updated in requests list")
-                    else:
-                        # this condition should not be possible unless somehow two or more entities
-                        # with the same coordinator AND ssid AND no private preshared keys
-                        # are created and selected
-                        requests[idrequestcoord][CONF_DATA][idrequestssid][CONF_PASSWORD] = password
-                except ValueError:
-                    if ppsk:
-                        keys[idkey] = {
-                            CONF_PASSWORD: password,
-                            UNIFI_NETWORKCONF_ID: network_id
-                        }
-                        entry = {
-                            CONF_SSID: ssid,
-                            UNIFI_PRESHARED_KEYS: keys
-                        }
-                    else:
-                        entry = {
-                            CONF_SSID: ssid,
-                            CONF_PASSWORD: password
-                        }
-                    requests[idrequestcoord][CONF_DATA].append(entry)
-                    if EXTRA_DEBUG: _LOGGER.debug("new ssid entry created in requests list")
-            except ValueError:
-                if ppsk:
-                    keys[idkey] = {
-                        CONF_PASSWORD: password,
-                        UNIFI_NETWORKCONF_ID: network_id
-                    }
-                    entry = {
-                        CONF_COORDINATOR: entity.attributes.get(CONF_COORDINATOR),
-                        CONF_DATA: [{
-                            CONF_SSID: ssid,
-                            UNIFI_PRESHARED_KEYS: keys
-                        }]
-                    }
-                else:
-                    entry = {
-                        CONF_COORDINATOR: entity.attributes.get(CONF_COORDINATOR),
-                        CONF_DATA: [{
-                            CONF_SSID: ssid,
-                            CONF_PASSWORD: password
-                        }]
-                    }
-                requests.append(entry)
-                if EXTRA_DEBUG: _LOGGER.debug("new coordinator entry created in requests list")
-
-        # send wlanconf change requests to controllers
-        if EXTRA_DEBUG: _LOGGER.debug("requests: %s", requests)
-        for request in requests:
-            idcoord = _coordinator_index(request[CONF_COORDINATOR])
-            coordinator = coordinators[idcoord]
-            for r in request[CONF_DATA]:
-                try:
-                    payload = {UNIFI_PRESHARED_KEYS: r[UNIFI_PRESHARED_KEYS]}
-                except:
-                    payload = {UNIFI_X_PASSPHRASE: r[CONF_PASSWORD]}
-                if EXTRA_DEBUG: _LOGGER.debug("ssid %s with payload %s", r[CONF_SSID], payload)
-                await coordinator.set_wlanconf(r[CONF_SSID], payload, False)
-
-
-    # DEPRECATED
-    async_register_admin_service(
-        hass,
-        DOMAIN,
-        SERVICE_CUSTOM_PASSWORD,
-        custom_password_service,
-        schema=SERVICE_CUSTOM_PASSWORD_SCHEMA
-    )
-
-    # DEPRECATED
-    async_register_admin_service(
-        hass,
-        DOMAIN,
-        SERVICE_RANDOM_PASSWORD,
-        random_password_service,
-        schema=SERVICE_RANDOM_PASSWORD_SCHEMA
+    services = (
+        (SERVICE_CUSTOM_PASSWORD, custom_password_service, SERVICE_CUSTOM_PASSWORD_SCHEMA), # DEPRECATED
+        (SERVICE_RANDOM_PASSWORD, random_password_service, SERVICE_RANDOM_PASSWORD_SCHEMA), # DEPRECATED
+        (SERVICE_ENABLE_WLAN, enable_wlan_service, SERVICE_ENABLE_WLAN_SCHEMA),
+        (SERVICE_HIDE_SSID, hide_ssid_service, SERVICE_HIDE_SSID_SCHEMA),
+        (SERVICE_HOTSPOT_PASSWORD, hotspot_password_service, SERVICE_HOTSPOT_PASSWORD_SCHEMA),
+        (SERVICE_WLAN_PASSWORD, wlan_password_service, SERVICE_WLAN_PASSWORD_SCHEMA),
     )
 
-    async_register_admin_service(
-        hass,
-        DOMAIN,
-        SERVICE_ENABLE_WLAN,
-        enable_wlan_service,
-        schema=SERVICE_ENABLE_WLAN_SCHEMA
-    )
-
-    async_register_admin_service(
-        hass,
-        DOMAIN,
-        SERVICE_HIDE_SSID,
-        hide_ssid_service,
-        schema=SERVICE_HIDE_SSID_SCHEMA
-    )
-
-    async_register_admin_service(
-        hass,
-        DOMAIN,
-        SERVICE_HOTSPOT_PASSWORD,
-        hotspot_password_service,
-        schema=SERVICE_HOTSPOT_PASSWORD_SCHEMA
-    )
-
-    async_register_admin_service(
-        hass,
-        DOMAIN,
-        SERVICE_WLAN_PASSWORD,
-        wlan_password_service,
-        schema=SERVICE_WLAN_PASSWORD_SCHEMA
-    )
+    for name, handler, schema in services:
+        async_register_admin_service(hass, DOMAIN, name, handler, schema=schema)
 
     return True
\ No newline at end of file